@@ -5,26 +5,336 @@ Participants will implement this connector to integrate with Aurora DSQL
 This file contains TODO items that participants need to complete during the study.
 """
 
+import datetime
+import hashlib
+import io
 import logging
 import os
-import select
+import random
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
 import boto3
+from botocore.config import Config
 
 import psycopg2
+import psycopg2.errors
 import psycopg2.extras
-from psycopg2 import OperationalError, sql
+from psycopg2 import OperationalError, pool, sql
+from psycopg2.extras import execute_batch
 import re
 
+from .base_connector import BaseDatabaseConnector
+
+__all__ = ["AuroraDSQLConnector"]
+
+logger = logging.getLogger(__name__)
+
 DDL_PATTERN = re.compile(
     r"^\s*(CREATE|ALTER|DROP|TRUNCATE|RENAME|GRANT|REVOKE)", re.IGNORECASE
 )
 DML_PATTERN = re.compile(r"^\s*(INSERT|UPDATE|DELETE)", re.IGNORECASE)
 
-from .base_connector import BaseDatabaseConnector
+# Leading keywords checked on the execute_query hot path; the patterns above
+# are only consulted when the first token is not a plain word.
+DDL_KEYWORDS = frozenset(
+    {"CREATE", "ALTER", "DROP", "TRUNCATE", "RENAME", "GRANT", "REVOKE"}
+)
+DML_KEYWORDS = frozenset({"INSERT", "UPDATE", "DELETE"})
+
+# IAM auth tokens are requested for this long and re-minted this many seconds
+# before they lapse, so a connection is never opened with a stale token.
+TOKEN_TTL_SECONDS = 3600
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+
+# Token minting only signs a URL locally, so the DSQL client gets short
+# timeouts and a single retry rather than botocore's default retry plumbing
+DSQL_CLIENT_CONFIG = Config(
+    retries={"total_max_attempts": 2, "mode": "standard"},
+    connect_timeout=2,
+    read_timeout=2,
+)
+
+# Substrings of the connect-time errors raised when DSQL rejects a token
+AUTH_ERROR_MARKERS = ("access denied", "authentication", "expired", "signature")
+
+# Aurora DSQL reports optimistic-concurrency conflicts as serialization
+# failures (SQLSTATE 40001); these are safe to retry from the top of the
+# transaction. Connection and auth errors are deliberately not retried here.
+RETRYABLE_ERRORS = (
+    psycopg2.errors.SerializationFailure,
+    psycopg2.errors.DeadlockDetected,
+)
+RETRY_BASE_DELAY_SECONDS = 0.05
+RETRY_MAX_DELAY_SECONDS = 20.0
+
+# Aurora DSQL caps how many rows one transaction may modify
+MAX_ROWS_PER_TRANSACTION = 3000
+
+# bulk_load sends COPY's text format: tab-separated fields, None as the \N
+# marker, and backslash, tab and line breaks escaped so that no data value
+# can be read as NULL or split a row
+COPY_NULL = "\\N"
+COPY_TEXT_ESCAPES = str.maketrans(
+    {"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"}
+)
+
+PLACEHOLDER_PATTERN = re.compile(r"%([%s])")
+
+# Server-side parameter types that keep a number parameter a number, as
+# psycopg2's client-side interpolation would. Fractional values must not land
+# in an integer or real parameter, where they would be silently rounded.
+NUMERIC_PARAM_TYPES = frozenset(
+    {"smallint", "integer", "bigint", "numeric", "real", "double precision"}
+)
+FRACTIONAL_PARAM_TYPES = frozenset({"numeric", "double precision"})
+
+# Fixed-shape NewOrder statements, prepared on every pooled connection so the
+# server skips parse/plan on each transaction. Keyed by the prepared name.
+NEW_ORDER_STATEMENTS = {
+    "no_claim_order_id": """
+        UPDATE district
+        SET d_next_o_id = d_next_o_id + 1
+        WHERE d_w_id = %s AND d_id = %s
+        RETURNING d_next_o_id - 1 AS o_id
+    """,
+    "no_get_customer": """
+        SELECT c_discount, c_credit, c_last
+        FROM customer
+        WHERE c_w_id = %s AND c_d_id = %s AND c_id = %s
+    """,
+    # orders, new_order and every order_line row in one statement; the order
+    # lines arrive as parallel arrays (line number, item, quantity, amount)
+    "no_insert_order": """
+        WITH o AS (
+            INSERT INTO orders (o_id, o_d_id, o_w_id, o_c_id, o_entry_d, o_carrier_id, o_ol_cnt, o_all_local, region_created)
+            VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP, NULL, %s, %s, NULL)
+            RETURNING o_id, o_d_id, o_w_id
+        ), n AS (
+            INSERT INTO new_order (no_o_id, no_d_id, no_w_id)
+            SELECT o_id, o_d_id, o_w_id FROM o
+        )
+        INSERT INTO order_line (
+            ol_o_id, ol_d_id, ol_w_id, ol_number,
+            ol_i_id, ol_supply_w_id, ol_delivery_d, ol_quantity, ol_amount, ol_dist_info
+        )
+        SELECT o.o_id, o.o_d_id, o.o_w_id, l.ol_number,
+               l.ol_i_id, o.o_w_id, NULL, l.ol_quantity, l.ol_amount, 'S_DIST_INFO'
+        FROM o, unnest(%s::int[], %s::int[], %s::int[], %s::numeric[])
+            AS l (ol_number, ol_i_id, ol_quantity, ol_amount)
+    """,
+    "no_get_prices": "SELECT i_id, i_price FROM item WHERE i_id = ANY(%s)",
+    "no_get_stock": """
+        SELECT s_i_id, s_quantity
+        FROM stock
+        WHERE s_w_id = %s AND s_i_id = ANY(%s)
+        FOR UPDATE
+    """,
+}
+
+
+def _classify_statement(query: str):
+    """Return ``(is_ddl, is_dml)`` for ``query`` based on its first keyword"""
+    head = query.lstrip()[:8].split(None, 1)
+    keyword = head[0].upper() if head else ""
+    if keyword.isalpha():
+        return keyword in DDL_KEYWORDS, keyword in DML_KEYWORDS
+    return bool(DDL_PATTERN.match(query)), bool(DML_PATTERN.match(query))
 
-logger = logging.getLogger(__name__)
+
+def _to_positional(query: str) -> str:
+    """Rewrite psycopg2 ``%s`` placeholders as PostgreSQL ``$n`` parameters"""
+    position = 0
+
+    def replace(match):
+        nonlocal position
+        if match.group(1) == "%":
+            return "%"
+        position += 1
+        return f"${position}"
+
+    return PLACEHOLDER_PATTERN.sub(replace, query)
+
+
+def _has_quoted_placeholder(query: str) -> bool:
+    """
+    Return True if a ``%s`` placeholder appears inside a single-quoted SQL
+    literal, e.g. ``INTERVAL '%s days'``.
+
+    psycopg2 interpolates such placeholders textually, but as ``$n`` they
+    would just be part of the literal, so these queries must not be prepared.
+    """
+    in_literal = False
+    for i, ch in enumerate(query):
+        if ch == "'":
+            in_literal = not in_literal
+        elif in_literal and ch == "%" and query[i + 1:i + 2] == "s":
+            return True
+    return False
+
+
+def _param_types_match(params, server_types) -> bool:
+    """
+    Check the parameter types the server inferred for a prepared statement
+    against the Python values it was prepared for.
+
+    The count must match, and numbers, booleans and dates must not have been
+    inferred as text (``SELECT $1`` is text, where ``SELECT 5`` is integer).
+    Floats and Decimals must not have been inferred as an integer, which
+    would round ``2.6`` to ``3``.
+    """
+    if len(server_types) != len(params):
+        return False
+    for value, server_type in zip(params, server_types):
+        if isinstance(value, bool):
+            if server_type != "boolean":
+                return False
+        elif isinstance(value, (float, Decimal)):
+            if server_type not in FRACTIONAL_PARAM_TYPES:
+                return False
+        elif isinstance(value, int):
+            if server_type not in NUMERIC_PARAM_TYPES:
+                return False
+        elif isinstance(value, datetime.date):
+            if not server_type.startswith(("date", "timestamp")):
+                return False
+    return True
+
+
+def _copy_text_row(row) -> str:
+    """Render one row as a line of COPY text format"""
+    return "\t".join(
+        COPY_NULL if value is None else str(value).translate(COPY_TEXT_ESCAPES)
+        for value in row
+    ) + "\n"
+
+
+# PREPARE and EXECUTE text for each NewOrder statement, built once at import
+# rather than on every connection and call
+NEW_ORDER_PREPARE = {
+    name: f"PREPARE {name} AS {_to_positional(query)}"
+    for name, query in NEW_ORDER_STATEMENTS.items()
+}
+NEW_ORDER_EXECUTE = {
+    name: "EXECUTE {} ({})".format(
+        name, ", ".join(["%s"] * len(PLACEHOLDER_PATTERN.findall(query.replace("%%", ""))))
+    )
+    for name, query in NEW_ORDER_STATEMENTS.items()
+}
+
+
+class _DSQLConnection(psycopg2.extensions.connection):
+    """psycopg2 connection that remembers which statements it has prepared"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+        # Aurora DSQL ends sessions after a fixed lifetime, so the pool
+        # retires connections by age
+        self.opened_at = time.monotonic()
+        # execute_query LRU: (stripped SQL text, parameter types) ->
+        # (prepared name, EXECUTE text), or None if the server refused to
+        # prepare it; tagged with the schema version it was built against
+        self.statement_cache = OrderedDict()
+        self.statement_cache_version = 0
+
+
+class _IAMAuthConnectionPool(pool.ThreadedConnectionPool):
+    """
+    Thread-safe psycopg2 connection pool for Aurora DSQL.
+
+    Aurora DSQL authenticates with short-lived IAM tokens instead of a static
+    password, so every new physical connection asks ``token_provider`` for the
+    password rather than reusing the one the pool was created with. If the
+    token is rejected, a new one is forced and the connect is retried once.
+    ``on_connect`` is called with each new connection before it is pooled.
+
+    psycopg2 closes returned connections once ``minconn`` are idle; this pool
+    keeps them, up to ``maxconn``, so bursts reuse warm, already prepared
+    sessions. Connections older than ``max_lifetime`` seconds are closed
+    instead of being handed out again. ``retire()`` closes the pool without
+    pulling connections out from under the threads that borrowed them.
+    """
+
+    def __init__(
+        self, minconn, maxconn, token_provider, on_connect, *args,
+        max_lifetime=None, **kwargs
+    ):
+        self._token_provider = token_provider
+        self._on_connect = on_connect
+        self._max_lifetime = max_lifetime
+        self._retired = False
+        super().__init__(minconn, maxconn, *args, **kwargs)
+
+    def _expired(self, conn) -> bool:
+        return (
+            self._max_lifetime is not None
+            and time.monotonic() - conn.opened_at >= self._max_lifetime
+        )
+
+    def _getconn(self, key=None):
+        if self._retired:
+            raise pool.PoolError("connection pool is closed")
+        for conn in [c for c in self._pool if self._expired(c)]:
+            self._pool.remove(conn)
+            conn.close()
+        return super()._getconn(key)
+
+    def _putconn(self, conn, key=None, close=False):
+        if self.closed:
+            raise pool.PoolError("connection pool is closed")
+        if key is None:
+            key = self._rused.get(id(conn))
+            if key is None:
+                raise pool.PoolError("trying to put unkeyed connection")
+
+        if close or conn.closed or self._retired or self._expired(conn):
+            conn.close()
+        elif conn.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+            # server connection lost
+            conn.close()
+        else:
+            if conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            self._pool.append(conn)
+
+        del self._used[key]
+        del self._rused[id(conn)]
+        if self._retired and not self._used:
+            self.closed = True
+
+    def retire(self):
+        """
+        Close idle connections now, and borrowed ones as they are returned.
+
+        Unlike ``closeall()``, connections still in use are left open until
+        their borrower puts them back; the pool is closed once the last one
+        is returned.
+        """
+        with self._lock:
+            self._retired = True
+            while self._pool:
+                self._pool.pop().close()
+            if not self._used:
+                self.closed = True
+
+    def _connect(self, key=None):
+        self._kwargs["password"] = self._token_provider()
+        try:
+            conn = super()._connect(key)
+        except OperationalError as e:
+            if not any(marker in str(e).lower() for marker in AUTH_ERROR_MARKERS):
+                raise
+            logger.warning("Aurora DSQL rejected cached auth token, regenerating")
+            self._kwargs["password"] = self._token_provider(force_refresh=True)
+            conn = super()._connect(key)
+        # Enable autocommit
+        conn.autocommit = True
+        self._on_connect(conn)
+        return conn
 
 
 class AuroraDSQLConnector(BaseDatabaseConnector):
@@ -35,10 +345,18 @@ class AuroraDSQLConnector(BaseDatabaseConnector):
     for Aurora DSQL during the UX study.
     """
 
-    def __init__(self):
+    # boto3 DSQL clients shared by all connectors, one per region
+    _dsql_clients = {}
+    _dsql_clients_lock = threading.Lock()
+
+    def __init__(self, eager_connect: bool = False):
         """
         Initialize Aurora DSQL connection
 
+        The connection pool is created on first use, or by ``open()`` /
+        entering the connector as a context manager. Pass
+        ``eager_connect=True`` to connect during construction instead.
+
         TODO: Implement Aurora DSQL connection initialization
         - Read configuration from environment variables
         - Set up AWS authentication and Aurora DSQL client
@@ -50,11 +368,26 @@ class AuroraDSQLConnector(BaseDatabaseConnector):
         - DSQL_CLUSTER_ENDPOINT: Aurora DSQL cluster endpoint
         - AWS_ACCESS_KEY_ID: AWS access key (or use IAM roles)
         - AWS_SECRET_ACCESS_KEY: AWS secret key (or use IAM roles)
+        - DSQL_POOL_MIN_SIZE: connections opened up front (default 1)
+        - DSQL_POOL_MAX_SIZE: upper bound on pooled connections, also how many
+          are kept open between bursts (default 10)
+        - DSQL_POOL_MAX_LIFETIME_SECONDS: age after which a pooled connection
+          is closed rather than reused (default 3300, under Aurora DSQL's
+          one-hour session limit)
+        - DSQL_POOL_TIMEOUT_SECONDS: how long a caller waits for a free pooled
+          connection before failing (default 30)
+        - DSQL_STATEMENT_CACHE_SIZE: prepared statements kept per connection,
+          0 disables server-side prepared statements (default 500)
+        - DSQL_HEALTH_CHECK_GRACE_SECONDS: how long after a successful call
+          test_connection() trusts the pool without a SELECT 1 (default 10)
+        - AWS_MAX_ATTEMPTS: attempts per transaction when Aurora DSQL reports
+          a concurrency conflict (default 3)
         """
         super().__init__()
         self.provider_name = "Amazon Aurora DSQL"
         # TODO: Initialize Aurora DSQL connection
-        self.connection = None
+        self.pool = None
+        self._pool_lock = threading.Lock()
 
         # TODO: Read configuration from environment
         self.region = os.getenv("AWS_REGION")
@@ -64,6 +397,29 @@ class AuroraDSQLConnector(BaseDatabaseConnector):
         self.password = os.getenv(
             "DSQL_PASSWORD"
         )  # For IAM auth, this would be a token
+        self.pool_min_size = int(os.getenv("DSQL_POOL_MIN_SIZE", "1"))
+        self.pool_max_size = int(os.getenv("DSQL_POOL_MAX_SIZE", "10"))
+        self.pool_timeout = float(os.getenv("DSQL_POOL_TIMEOUT_SECONDS", "30"))
+        self.pool_max_lifetime = float(
+            os.getenv("DSQL_POOL_MAX_LIFETIME_SECONDS", "3300")
+        )
+        self._pool_slots = threading.BoundedSemaphore(self.pool_max_size)
+        self.statement_cache_size = int(os.getenv("DSQL_STATEMENT_CACHE_SIZE", "500"))
+        self.max_attempts = max(1, int(os.getenv("AWS_MAX_ATTEMPTS", "3")))
+        self.health_check_grace = float(
+            os.getenv("DSQL_HEALTH_CHECK_GRACE_SECONDS", "10")
+        )
+        # time.monotonic() of the last successful connect or pooled call, or
+        # None if the connection has not been verified since the last failure
+        self._last_ok_ts = None
+        # Bumped after every DDL so connections drop statements prepared
+        # against the old schema
+        self._schema_version = 0
+
+        # Cached IAM auth token and its expiry on the time.monotonic() clock
+        self._token = None
+        self._token_exp = 0.0
+        self._token_lock = threading.Lock()
 
         # Validate required configuration
         missing_vars = [
@@ -80,65 +436,306 @@ class AuroraDSQLConnector(BaseDatabaseConnector):
             f"Initializing Aurora DSQL connector for endpoint: {self.cluster_endpoint}"
         )
 
-        # Establish connection immediately
-        self._connect()
+        # Build the boto3 client up front so the first connect only pays for signing
+        self._dsql = self._get_dsql_client(self.region)
+
+        if eager_connect:
+            self.open()
 
         # TODO: Initialize Aurora DSQL client and connection
-        
-    def _get_aurora_dsql_token(self):
-        dsql = boto3.client('dsql', region_name=self.region)
-        
-        token = dsql.generate_db_connect_admin_auth_token(
-            Hostname=self.cluster_endpoint,     # e.g. "xyz.dsql.us-west-2.on.aws"
-            Region=self.region,                 # or omit to default to client region
-            ExpiresIn=3600                      # optional: duration in seconds (max: 604800 = 1 week)
-        )
-        return token
 
-    def _connect(self):
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close_connection()
+
+    @classmethod
+    def _get_dsql_client(cls, region: str):
+        """Return the shared boto3 DSQL client for ``region``, creating it once"""
+        with cls._dsql_clients_lock:
+            client = cls._dsql_clients.get(region)
+            if client is None:
+                client = boto3.client(
+                    'dsql', region_name=region, config=DSQL_CLIENT_CONFIG
+                )
+                cls._dsql_clients[region] = client
+            return client
+
+    def _get_aurora_dsql_token(self, force_refresh: bool = False) -> str:
         """
-        Test connection to Aurora DSQL database
+        Return an IAM auth token for the cluster.
 
-        TODO: Implement connection testing
-        - Test connection to Aurora DSQL cluster
-        - Execute a simple query to verify connectivity
-        - Return True if successful, False otherwise
-        - Log connection status for study data collection
+        The token is reused until it is within TOKEN_REFRESH_MARGIN_SECONDS of
+        expiring, so pool refills do not pay for SigV4 signing every time.
+        """
+        with self._token_lock:
+            if (
+                not force_refresh
+                and self._token
+                and time.monotonic() < self._token_exp - TOKEN_REFRESH_MARGIN_SECONDS
+            ):
+                return self._token
 
-        Returns:
-            bool: True if connection successful, False otherwise
+            self._token = self._dsql.generate_db_connect_admin_auth_token(
+                Hostname=self.cluster_endpoint,     # e.g. "xyz.dsql.us-west-2.on.aws"
+                Region=self.region,                 # or omit to default to client region
+                ExpiresIn=TOKEN_TTL_SECONDS         # optional: duration in seconds (max: 604800 = 1 week)
+            )
+            self._token_exp = time.monotonic() + TOKEN_TTL_SECONDS
+            return self._token
+
+    def _connect(self):
+        """
+        Create the Aurora DSQL connection pool
+
+        Opens ``pool_min_size`` connections immediately; further connections
+        are opened on demand, each authenticated with a current IAM auth
+        token, up to ``pool_max_size``.
         """
         try:
-            start_time = time.time()
-            token = self._get_aurora_dsql_token()
-            self.connection = psycopg2.connect(
+            start_time = time.monotonic()
+            self.pool = _IAMAuthConnectionPool(
+                self.pool_min_size,
+                self.pool_max_size,
+                self._get_aurora_dsql_token,
+                self._prepare_connection,
                 host=self.cluster_endpoint,
                 user=self.user,
-                password=token,
                 # password=self.password,
                 dbname=self.db_name,
                 port=5432,
                 connect_timeout=10,
                 sslmode="require",  # DSQL requires SSL
                 cursor_factory=psycopg2.extras.RealDictCursor,
+                connection_factory=_DSQLConnection,
+                max_lifetime=self.pool_max_lifetime,
+            )
+            self._last_ok_ts = time.monotonic()
+            elapsed = time.monotonic() - start_time
+            logger.info(
+                f"Connected to Aurora DSQL in {elapsed:.2f}s "
+                f"(pool size {self.pool_min_size}-{self.pool_max_size})"
             )
-            # Enable autocommit
-            self.connection.autocommit = True
-            elapsed = time.time() - start_time
-            logger.info(f"Connected to Aurora DSQL in {elapsed:.2f}s")
         except OperationalError as e:
             logger.error(f"Failed to connect to Aurora DSQL: {str(e)}")
             raise
 
+    def open(self):
+        """Create the connection pool if it does not exist yet"""
+        if self.pool is None:
+            with self._pool_lock:
+                if self.pool is None:
+                    self._connect()
+        return self
+
+    def _prepare_connection(self, conn):
+        """
+        PREPARE the NewOrder statements on a freshly opened connection.
+
+        Prepared statements are bound to the server session, so this runs for
+        every new pooled connection. If the server refuses, the connection is
+        left unprepared and NewOrder falls back to plain statements.
+        """
+        if self.statement_cache_size <= 0:
+            return
+
+        try:
+            with conn.cursor() as cur:
+                for name, prepare in NEW_ORDER_PREPARE.items():
+                    cur.execute(prepare)
+                    conn.prepared.add(name)
+        except psycopg2.Error as e:
+            logger.warning(f"Could not prepare NewOrder statements: {str(e)}")
+
+    def _statement_sql(self, cur, name: str, params: tuple) -> bytes:
+        """Render a NEW_ORDER_STATEMENTS entry, as EXECUTE when it is prepared"""
+        if name in cur.connection.prepared:
+            return cur.mogrify(NEW_ORDER_EXECUTE[name], params)
+        return cur.mogrify(NEW_ORDER_STATEMENTS[name], params)
+
+    def _execute_statement(self, cur, name: str, params: tuple):
+        """Run a NEW_ORDER_STATEMENTS entry, via EXECUTE when it is prepared"""
+        cur.execute(self._statement_sql(cur, name, params))
+
+    def _execute_cached(self, cur, query: str, params: tuple):
+        """
+        Execute a parameterized query through the connection's LRU cache of
+        prepared statements.
+
+        The first time a query text is seen on a connection with a given set
+        of Python parameter types it is PREPAREd under a name derived from
+        both; later calls with the same types send only EXECUTE.
+        The least recently used statement is DEALLOCATEd once the cache holds
+        more than ``statement_cache_size`` entries.
+
+        A prepared statement is only kept if the server inferred the same
+        parameters psycopg2 would interpolate (see ``_param_types_match``);
+        otherwise it is DEALLOCATEd and the query runs unprepared whenever it
+        is called with those types. Keying on the types means values the
+        server would cast differently, such as a float where an int was
+        prepared, are checked again rather than sent to the old statement.
+        """
+        conn = cur.connection
+        cache = conn.statement_cache
+        if conn.statement_cache_version != self._schema_version:
+            for stale in filter(None, cache.values()):
+                cur.execute(f"DEALLOCATE {stale[0]}")
+            cache.clear()
+            conn.statement_cache_version = self._schema_version
+
+        key = (query.strip(), tuple(type(param) for param in params))
+        if key in cache:
+            cache.move_to_end(key)
+            entry = cache[key]
+        else:
+            entry = None
+            if not _has_quoted_placeholder(key[0]):
+                entry = self._prepare_cached(cur, key, params)
+            cache[key] = entry
+            if len(cache) > self.statement_cache_size:
+                _, evicted = cache.popitem(last=False)
+                if evicted:
+                    cur.execute(f"DEALLOCATE {evicted[0]}")
+
+        if entry is None:
+            cur.execute(query, params)
+        else:
+            cur.execute(entry[1], params)
+
+    def _prepare_cached(self, cur, key: tuple, params: tuple):
+        """
+        PREPARE the query in ``key`` for the statement cache and return its
+        cache entry, or None if it cannot be prepared with the same meaning.
+        """
+        text, types = key
+        signature = "\0".join([text, *(t.__qualname__ for t in types)])
+        name = "s" + hashlib.blake2b(signature.encode(), digest_size=8).hexdigest()
+        try:
+            cur.execute(f"PREPARE {name} AS {_to_positional(text)}")
+        except psycopg2.Error as e:
+            logger.debug("Not caching unpreparable query: %s", e)
+            return None
+
+        try:
+            with cur.connection.cursor(cursor_factory=psycopg2.extensions.cursor) as check:
+                check.execute(
+                    "SELECT parameter_types::text[] FROM pg_prepared_statements WHERE name = %s",
+                    (name,)
+                )
+                row = check.fetchone()
+            verified = row is not None and _param_types_match(params, row[0] or [])
+        except psycopg2.Error as e:
+            logger.debug("Could not verify prepared statement parameters: %s", e)
+            verified = False
+
+        if not verified:
+            logger.debug("Not caching query with mismatched parameters: %s", text)
+            cur.execute(f"DEALLOCATE {name}")
+            return None
+
+        placeholders = ", ".join(["%s"] * len(params))
+        return (name, f"EXECUTE {name} ({placeholders})")
+
+    def _run_with_retries(self, operation):
+        """
+        Call ``operation()`` and return its result, retrying Aurora DSQL
+        concurrency conflicts.
+
+        Each retry waits a random delay up to ``base * 2**attempt`` seconds
+        (capped), the "full jitter" backoff, so that conflicting clients
+        spread out instead of colliding again. Gives up after
+        ``max_attempts`` and re-raises the last conflict.
+        """
+        for attempt in range(self.max_attempts):
+            try:
+                return operation()
+            except RETRYABLE_ERRORS as e:
+                if attempt + 1 >= self.max_attempts:
+                    raise
+                delay = random.uniform(
+                    0, min(RETRY_MAX_DELAY_SECONDS, RETRY_BASE_DELAY_SECONDS * 2**attempt)
+                )
+                logger.warning(
+                    f"Aurora DSQL conflict ({e.pgcode}), retrying in {delay:.3f}s "
+                    f"(attempt {attempt + 1}/{self.max_attempts})"
+                )
+                time.sleep(delay)
+
+    @contextmanager
+    def _get_conn(self, autocommit: bool = True):
+        """
+        Borrow a connection from the pool for the duration of a ``with`` block.
+
+        Waits up to ``pool_timeout`` seconds when all ``pool_max_size``
+        connections are borrowed. Pooled connections run in autocommit mode;
+        pass ``autocommit=False`` to get an explicit transaction that the
+        block must commit. Connections the client already knows are closed
+        are discarded rather than handed out. Any open transaction is rolled
+        back if the block raises, and the connection is always handed back to
+        the pool in autocommit mode.
+        """
+        # Hold on to this pool, so a concurrent close_connection() cannot
+        # leave the connection with nowhere to be returned
+        conn_pool = self.pool
+        while conn_pool is None:
+            self.open()
+            conn_pool = self.pool
+
+        # ThreadedConnectionPool raises PoolError instead of waiting when every
+        # connection is borrowed, so callers queue here for a free slot
+        if not self._pool_slots.acquire(timeout=self.pool_timeout):
+            raise pool.PoolError(
+                f"Timed out after {self.pool_timeout}s waiting for an Aurora DSQL connection"
+            )
+        try:
+            conn = conn_pool.getconn()
+            while conn.closed != 0:
+                conn_pool.putconn(conn, close=True)
+                conn = conn_pool.getconn()
+
+            if not autocommit:
+                conn.autocommit = False
+
+            try:
+                yield conn
+                self._last_ok_ts = time.monotonic()
+            except Exception:
+                self._last_ok_ts = None
+                if not conn.closed:
+                    try:
+                        conn.rollback()
+                    except Exception as rollback_err:
+                        logger.warning(f"Rollback failed: {rollback_err}")
+                raise
+            finally:
+                if not conn.closed and not conn.autocommit:
+                    try:
+                        if conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                            conn.rollback()
+                        conn.autocommit = True
+                    except Exception as reset_err:
+                        logger.warning(f"Could not reset pooled connection: {reset_err}")
+                conn_pool.putconn(conn)
+        finally:
+            self._pool_slots.release()
+
     def test_connection(self) -> bool:
         """
         Test connection to Aurora DSQL database by executing a simple SELECT query.
+
+        The round trip is skipped if a pooled call succeeded within the last
+        ``health_check_grace`` seconds.
         """
-        try:
-            if not self.connection:
-                self._connect()
+        if (
+            self._last_ok_ts is not None
+            and time.monotonic() - self._last_ok_ts < self.health_check_grace
+        ):
+            logger.debug("Aurora DSQL connection recently verified, skipping SELECT 1")
+            return True
 
-            with self.connection.cursor() as cur:
+        try:
+            with self._get_conn() as conn, conn.cursor() as cur:
                 cur.execute("SELECT 1 AS test")
                 result = cur.fetchone()
                 if result and result["test"] == 1:
@@ -160,50 +757,159 @@ class AuroraDSQLConnector(BaseDatabaseConnector):
         - Max 3,000 rows modified per transaction
         """
         try:
-            if not self.connection:
-                self._connect()
+            is_ddl, is_dml = _classify_statement(query)
+            # Only positional-parameter templates are worth preparing
+            use_cache = (
+                self.statement_cache_size > 0
+                and not is_ddl
+                and isinstance(params, (tuple, list))
+                and len(params) > 0
+                and "%(" not in query
+            )
 
-            is_ddl = bool(DDL_PATTERN.match(query))
-            is_dml = bool(DML_PATTERN.match(query))
+            start_time = time.monotonic()
+            rows = self._run_with_retries(
+                lambda: self._run_query(query, params, is_ddl, is_dml, use_cache)
+            )
 
-            start_time = time.time()
-            rows = []
+            if logger.isEnabledFor(logging.DEBUG):
+                elapsed = time.monotonic() - start_time
+                logger.debug("Executed query in %.2fs: %s", elapsed, query)
+            return rows
 
-            with self.connection.cursor() as cur:
-                if is_ddl:
-                    # DDL must be in its own transaction
-                    logger.debug("Executing DDL in its own transaction")
-                    cur.execute(query, params or ())
-                    self.connection.commit()
-                elif is_dml:
-                    # Optionally enforce row limit — relies on LIMIT clause in query
-                    # if "limit" not in query.lower():
-                    #     logger.warning(
-                    #         "DML detected without explicit LIMIT — may exceed 3,000-row limit"
-                    #     )
+        except Exception as e:
+            logger.error(
+                f"Aurora DSQL query execution failed: {str(e)}\nQuery: {query}"
+            )
+            raise
+
+    def _run_query(self, query, params, is_ddl, is_dml, use_cache):
+        """Run one attempt of an execute_query call on a pooled connection"""
+        rows = []
+        with self._get_conn() as conn, conn.cursor() as cur:
+            if is_ddl:
+                # DDL must be in its own transaction
+                logger.debug("Executing DDL in its own transaction")
+                cur.execute(query, params or ())
+                conn.commit()
+                self._schema_version += 1
+            elif is_dml:
+                # Optionally enforce row limit — relies on LIMIT clause in query
+                # if "limit" not in query.lower():
+                #     logger.warning(
+                #         "DML detected without explicit LIMIT — may exceed 3,000-row limit"
+                #     )
+                if use_cache:
+                    self._execute_cached(cur, query, params)
+                else:
                     cur.execute(query, params or ())
-                    self.connection.commit()
-                    if cur.description:
-                        rows = cur.fetchall()
+                conn.commit()
+                if cur.description:
+                    rows = cur.fetchall()
+            else:
+                # Read-only or other statements
+                if use_cache:
+                    self._execute_cached(cur, query, params)
                 else:
-                    # Read-only or other statements
                     cur.execute(query, params or ())
-                    if cur.description:
-                        rows = cur.fetchall()
+                if cur.description:
+                    rows = cur.fetchall()
+        return rows
 
-            elapsed = time.time() - start_time
-            logger.debug(f"Executed query in {elapsed:.2f}s: {query}")
-            return rows
+    def execute_many(
+        self, query: str, params_list: List[tuple], page_size: int = 128
+    ) -> None:
+        """
+        Execute a DML statement for every parameter tuple in ``params_list``.
+
+        Statements are sent with psycopg2's execute_batch, ``page_size`` of
+        them per round trip. Each page runs as its own autocommitted
+        transaction and is retried on its own after a concurrency conflict,
+        so pages that already committed are not sent again. ``page_size`` may
+        not exceed MAX_ROWS_PER_TRANSACTION; statements that modify more than
+        one row each need a correspondingly smaller page.
+
+        Raises:
+            ValueError: if ``page_size`` is not between 1 and
+                MAX_ROWS_PER_TRANSACTION
+        """
+        if not 0 < page_size <= MAX_ROWS_PER_TRANSACTION:
+            raise ValueError(
+                f"page_size must be between 1 and {MAX_ROWS_PER_TRANSACTION}, "
+                f"got {page_size}"
+            )
 
+        def run_page(page):
+            with self._get_conn() as conn, conn.cursor() as cur:
+                execute_batch(cur, query, page, page_size=page_size)
+
+        try:
+            start_time = time.monotonic()
+            for i in range(0, len(params_list), page_size):
+                page = params_list[i:i + page_size]
+                self._run_with_retries(lambda: run_page(page))
+
+            if logger.isEnabledFor(logging.DEBUG):
+                elapsed = time.monotonic() - start_time
+                logger.debug(
+                    "Executed %d statements in %.2fs: %s", len(params_list), elapsed, query
+                )
         except Exception as e:
             logger.error(
-                f"Aurora DSQL query execution failed: {str(e)}\nQuery: {query}"
+                f"Aurora DSQL batch execution failed: {str(e)}\nQuery: {query}"
             )
-            if self.connection:
-                try:
-                    self.connection.rollback()
-                except Exception as rollback_err:
-                    logger.warning(f"Rollback failed: {rollback_err}")
+            raise
+
+    def bulk_load(
+        self,
+        table: Union[str, Sequence[str]],
+        columns: Sequence[str],
+        rows: Iterable[Sequence[Any]],
+    ) -> int:
+        """
+        Load rows into ``table`` with COPY ... FROM STDIN instead of INSERTs.
+
+        Rows are streamed in COPY's text format in chunks of
+        MAX_ROWS_PER_TRANSACTION, each chunk committed as its own COPY so no
+        transaction exceeds Aurora DSQL's row limit. ``None`` loads as NULL;
+        every other value, including ``""`` and ``"\\N"``, loads as itself.
+        ``table`` is a bare table name, or a ``(schema, table)`` tuple for a
+        schema-qualified one.
+
+        Returns:
+            int: number of rows loaded
+        """
+        table_parts = (table,) if isinstance(table, str) else tuple(table)
+        copy_sql = sql.SQL("COPY {} ({}) FROM STDIN").format(
+            sql.Identifier(*table_parts),
+            sql.SQL(", ").join(map(sql.Identifier, columns)),
+        )
+        table_name = ".".join(table_parts)
+
+        def copy_chunk(chunk):
+            buf = io.StringIO("".join(map(_copy_text_row, chunk)))
+            with self._get_conn() as conn, conn.cursor() as cur:
+                cur.copy_expert(copy_sql, buf)
+
+        try:
+            start_time = time.monotonic()
+            loaded = 0
+            chunk = []
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) == MAX_ROWS_PER_TRANSACTION:
+                    copy_chunk(chunk)
+                    loaded += len(chunk)
+                    chunk = []
+            if chunk:
+                copy_chunk(chunk)
+                loaded += len(chunk)
+
+            elapsed = time.monotonic() - start_time
+            logger.info(f"Loaded {loaded} rows into {table_name} in {elapsed:.2f}s")
+            return loaded
+        except Exception as e:
+            logger.error(f"Aurora DSQL bulk load into {table_name} failed: {str(e)}")
             raise
 
     def get_provider_name(self) -> str:
@@ -212,13 +918,19 @@ class AuroraDSQLConnector(BaseDatabaseConnector):
 
     def close_connection(self):
         """
-        Close the database connection.
+        Close all pooled database connections.
+
+        Idle connections are closed immediately; connections other threads
+        are still using are closed as they are handed back.
         """
         try:
-            if self.connection:
-                self.connection.close()
-                logger.info("Aurora DSQL connection closed")
-                self.connection = None
+            with self._pool_lock:
+                conn_pool, self.pool = self.pool, None
+                # A closed pool has nothing left for test_connection() to trust
+                self._last_ok_ts = None
+            if conn_pool:
+                conn_pool.retire()
+                logger.info("Aurora DSQL connection pool closed")
         except Exception as e:
             logger.error(f"Connection cleanup failed: {str(e)}")
 
@@ -227,7 +939,7 @@ class AuroraDSQLConnector(BaseDatabaseConnector):
         warehouse_id: int,
         district_id: int,
         customer_id: int,
-        items: List[Dict[str, Any]]
+        items: Union[List[Dict[str, Any]], Dict[str, List[int]]]
     ) -> int:
         """
         Execute TPC-C New Order transaction.
@@ -237,140 +949,135 @@ class AuroraDSQLConnector(BaseDatabaseConnector):
             district_id (int)
             customer_id (int)
             items (list of dict): [{'item_id': int, 'quantity': int}]
+                or parallel lists: {'item_ids': [int], 'quantities': [int]}
         
         Returns:
             int: new order ID
         """
         try:
-            if not self.connection:
-                self._connect()
-
-            with self.connection.cursor() as cur:
-                # 1. Get next order ID for district
-                cur.execute(
-                    """
-                    SELECT d_next_o_id FROM district
-                    WHERE d_w_id = %s AND d_id = %s
-                    FOR UPDATE
-                    """,
-                    (warehouse_id, district_id)
-                )
-                d_row = cur.fetchone()
-                if not d_row:
-                    raise ValueError("District not found")
-                next_o_id = d_row["d_next_o_id"]
-
-                # 2. Increment district next order ID
-                cur.execute(
-                    """
-                    UPDATE district
-                    SET d_next_o_id = d_next_o_id + 1
-                    WHERE d_w_id = %s AND d_id = %s
-                    """,
-                    (warehouse_id, district_id)
-                )
+            if isinstance(items, dict):
+                item_ids = list(items["item_ids"])
+                quantities = list(items["quantities"])
+                if len(item_ids) != len(quantities):
+                    raise ValueError("item_ids and quantities must be the same length")
+            else:
+                item_ids = [item["item_id"] for item in items]
+                quantities = [item["quantity"] for item in items]
 
-                # 3. Get customer info for discount, credit, etc.
-                cur.execute(
-                    """
-                    SELECT c_discount, c_credit, c_last
-                    FROM customer
-                    WHERE c_w_id = %s AND c_d_id = %s AND c_id = %s
-                    """,
-                    (warehouse_id, district_id, customer_id)
-                )
-                customer = cur.fetchone()
-                if not customer:
-                    raise ValueError("Customer not found")
-
-                o_ol_cnt = len(items)
-                o_all_local = 1  # assuming all items from local warehouse
-
-                # 4. Insert into orders
-                cur.execute(
-                    """
-                    INSERT INTO orders (o_id, o_d_id, o_w_id, o_c_id, o_entry_d, o_carrier_id, o_ol_cnt, o_all_local, region_created)
-                    VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP, NULL, %s, %s, NULL)
-                    """,
-                    (next_o_id, district_id, warehouse_id, customer_id, o_ol_cnt, o_all_local)
+            next_o_id = self._run_with_retries(
+                lambda: self._new_order_transaction(
+                    warehouse_id, district_id, customer_id, item_ids, quantities
                 )
+            )
+            logger.info(f"New order {next_o_id} created for customer {customer_id}")
+            return {"success": True, "order_id": next_o_id}
 
-                # 5. Insert into new_order
-                cur.execute(
-                    """
-                    INSERT INTO new_order (no_o_id, no_d_id, no_w_id)
-                    VALUES (%s, %s, %s)
-                    """,
-                    (next_o_id, district_id, warehouse_id)
-                )
+        except Exception as e:
+            logger.error(f"Failed to execute new order: {str(e)}")
+            raise
 
-                # 6. Process each item
-                for line_number, item in enumerate(items, start=1):
-                    item_id = item["item_id"]
-                    quantity = item["quantity"]
+    def _new_order_transaction(
+        self,
+        warehouse_id: int,
+        district_id: int,
+        customer_id: int,
+        item_ids: List[int],
+        quantities: List[int]
+    ) -> int:
+        """Run one attempt of the NewOrder transaction and return the order ID"""
+        # Plain tuple cursor: NewOrder only reads a column or two per row,
+        # so the per-row dicts of the pool's RealDictCursor are wasted
+        with self._get_conn(autocommit=False) as conn, conn.cursor(
+            cursor_factory=psycopg2.extensions.cursor
+        ) as cur:
+            # 1. Claim the next order ID for the district in one round trip
+            self._execute_statement(
+                cur, "no_claim_order_id", (warehouse_id, district_id)
+            )
+            d_row = cur.fetchone()
+            if not d_row:
+                raise ValueError("District not found")
+            next_o_id = d_row[0]
 
-                    # Get item price
-                    cur.execute(
-                        "SELECT i_price FROM item WHERE i_id = %s",
-                        (item_id,)
-                    )
-                    item_row = cur.fetchone()
-                    if not item_row:
-                        raise ValueError(f"Item {item_id} not found")
-                    price = item_row["i_price"]
+            # 2. Get customer info for discount, credit, etc.
+            self._execute_statement(
+                cur, "no_get_customer", (warehouse_id, district_id, customer_id)
+            )
+            customer = cur.fetchone()
+            if not customer:
+                raise ValueError("Customer not found")
 
-                    # Update stock
-                    cur.execute(
-                        """
-                        SELECT s_quantity, s_ytd, s_order_cnt, s_remote_cnt
-                        FROM stock
-                        WHERE s_w_id = %s AND s_i_id = %s
-                        FOR UPDATE
-                        """,
-                        (warehouse_id, item_id)
-                    )
-                    stock = cur.fetchone()
-                    if not stock:
-                        raise ValueError(f"Stock for item {item_id} not found")
+            # 3. Fetch prices and stock for every item in one query each
+            self._execute_statement(cur, "no_get_prices", (item_ids,))
+            price_map = dict(cur.fetchall())  # i_id -> i_price
+            for item_id in item_ids:
+                if item_id not in price_map:
+                    raise ValueError(f"Item {item_id} not found")
+
+            self._execute_statement(cur, "no_get_stock", (warehouse_id, item_ids))
+            stock_map = dict(cur.fetchall())  # s_i_id -> s_quantity
+            for item_id in item_ids:
+                if item_id not in stock_map:
+                    raise ValueError(f"Stock for item {item_id} not found")
 
-                    new_qty = stock["s_quantity"] - quantity
-                    if new_qty < 10:
-                        new_qty += 100  # TPC-C wrap-around
+            # Nothing below reads a result, so the writes are rendered
+            # client-side and sent to the server as one multi-statement batch
+            writes = []
 
-                    cur.execute(
+            # 4. Update stock for all items in a single CASE-based UPDATE
+            stock_updates = {}  # item_id -> [s_quantity, s_ytd delta, s_order_cnt delta]
+            for item_id, quantity in zip(item_ids, quantities):
+                new_qty = stock_map[item_id] - quantity
+                if new_qty < 10:
+                    new_qty += 100  # TPC-C wrap-around
+                # Keep the local copy current in case the item repeats
+                stock_map[item_id] = new_qty
+
+                update = stock_updates.setdefault(item_id, [0, 0, 0])
+                update[0] = new_qty
+                update[1] += quantity
+                update[2] += 1
+
+            if stock_updates:
+                when_then = sql.SQL(" ").join(
+                    [sql.SQL("WHEN %s THEN %s")] * len(stock_updates)
+                )
+                writes.append(cur.mogrify(
+                    sql.SQL(
                         """
                         UPDATE stock
-                        SET s_quantity = %s,
-                            s_ytd = s_ytd + %s,
-                            s_order_cnt = s_order_cnt + 1
-                        WHERE s_w_id = %s AND s_i_id = %s
-                        """,
-                        (new_qty, quantity, warehouse_id, item_id)
-                    )
-
-                    # Insert into order_line
-                    ol_amount = quantity * price
-                    cur.execute(
+                        SET s_quantity = CASE s_i_id {cases} END,
+                            s_ytd = s_ytd + CASE s_i_id {cases} END,
+                            s_order_cnt = s_order_cnt + CASE s_i_id {cases} END
+                        WHERE s_w_id = %s AND s_i_id = ANY(%s)
                         """
-                        INSERT INTO order_line (
-                            ol_o_id, ol_d_id, ol_w_id, ol_number,
-                            ol_i_id, ol_supply_w_id, ol_delivery_d, ol_quantity, ol_amount, ol_dist_info
-                        )
-                        VALUES (%s, %s, %s, %s, %s, %s, NULL, %s, %s, %s)
-                        """,
-                        (
-                            next_o_id, district_id, warehouse_id, line_number,
-                            item_id, warehouse_id, quantity, ol_amount, "S_DIST_INFO"
-                        )
+                    ).format(cases=when_then),
+                    (
+                        *[v for i, u in stock_updates.items() for v in (i, u[0])],
+                        *[v for i, u in stock_updates.items() for v in (i, u[1])],
+                        *[v for i, u in stock_updates.items() for v in (i, u[2])],
+                        warehouse_id,
+                        list(stock_updates),
                     )
+                ))
+
+            # 5. Insert the order, its new_order row and all order lines
+            o_ol_cnt = len(item_ids)
+            o_all_local = 1  # assuming all items from local warehouse
+            writes.append(self._statement_sql(
+                cur,
+                "no_insert_order",
+                (
+                    next_o_id, district_id, warehouse_id, customer_id, o_ol_cnt, o_all_local,
+                    list(range(1, o_ol_cnt + 1)),
+                    item_ids,
+                    quantities,
+                    [q * price_map[i] for i, q in zip(item_ids, quantities)],
+                )
+            ))
 
-                # 7. Commit transaction
-                self.connection.commit()
-                logger.info(f"New order {next_o_id} created for customer {customer_id}")
-                return {"success": True, "order_id": next_o_id}
+            cur.execute(b";".join(writes))
 
-        except Exception as e:
-            logger.error(f"Failed to execute new order: {str(e)}")
-            if self.connection:
-                self.connection.rollback()
-            raise
\ No newline at end of file
+            # 6. Commit transaction
+            conn.commit()
+            return next_o_id
\ No newline at end of file
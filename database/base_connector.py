@@ -36,6 +36,13 @@ class BaseDatabaseConnector(ABC):
         """Execute a query and return results as list of dictionaries"""
         pass
 
+    def execute_many(
+        self, query: str, params_list: List[tuple], page_size: int = 128
+    ) -> None:
+        """Execute a DML statement once for each parameter tuple (``page_size`` is a batching hint)"""
+        for params in params_list:
+            self.execute_query(query, params)
+
     def get_provider_name(self) -> str:
         """Get the database provider name"""
         return self.provider_name
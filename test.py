@@ -7,6 +7,6 @@ load_dotenv()
 
 
 if __name__ == "__main__":
-    aConnector = AuroraDSQLConnector()
-    a = aConnector.test_connection()
+    with AuroraDSQLConnector() as aConnector:
+        a = aConnector.test_connection()
     print("TEST RESULT: ", a)
\ No newline at end of file
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Aurora DSQL Connector Helper Tests
+Tests the statement cache, connection pool, retry and auth token helpers
+without a database
+"""
+
+import datetime
+import os
+import sys
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest import mock
+
+import psycopg2.errors
+import psycopg2.extensions
+import psycopg2.pool
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.aurora_connector import (
+    RETRY_BASE_DELAY_SECONDS,
+    TOKEN_REFRESH_MARGIN_SECONDS,
+    TOKEN_TTL_SECONDS,
+    AuroraDSQLConnector,
+    _IAMAuthConnectionPool,
+    _classify_statement,
+    _copy_text_row,
+    _has_quoted_placeholder,
+    _param_types_match,
+    _to_positional,
+)
+
+
+def test_to_positional():
+    """Test %s placeholders are numbered and %% is unescaped"""
+    assert _to_positional("SELECT 1") == "SELECT 1"
+    assert (
+        _to_positional("SELECT * FROM t WHERE a = %s AND b = ANY(%s)")
+        == "SELECT * FROM t WHERE a = $1 AND b = ANY($2)"
+    )
+    assert (
+        _to_positional("SELECT * FROM t WHERE name LIKE '%%x' AND id = %s")
+        == "SELECT * FROM t WHERE name LIKE '%x' AND id = $1"
+    )
+
+
+def test_has_quoted_placeholder():
+    """Test placeholders inside string literals are detected"""
+    assert _has_quoted_placeholder(
+        "SELECT * FROM history WHERE h_date >= CURRENT_DATE - INTERVAL '%s days'"
+    )
+    assert _has_quoted_placeholder("SELECT count(*) FROM item WHERE i_id::text = '%s'")
+    assert not _has_quoted_placeholder("SELECT * FROM item WHERE i_id = %s")
+    assert not _has_quoted_placeholder(
+        "SELECT * FROM item WHERE i_name = 'it''s' AND i_id = %s"
+    )
+    assert not _has_quoted_placeholder("SELECT * FROM t WHERE a LIKE '%%x' AND b = %s")
+
+
+def test_param_types_match():
+    """Test server-inferred parameter types are checked against the values"""
+    assert _param_types_match((30,), ["integer"])
+    assert _param_types_match((Decimal("1.50"), "abc"), ["numeric", "text"])
+    assert _param_types_match((True,), ["boolean"])
+    assert _param_types_match((datetime.date(2026, 1, 1),), ["date"])
+
+    # Placeholder swallowed by a literal: the server sees no parameters
+    assert not _param_types_match((30,), [])
+    # SELECT $1 is inferred as text, SELECT 5 would be an integer
+    assert not _param_types_match((5,), ["text"])
+    assert not _param_types_match((True,), ["integer"])
+    assert not _param_types_match((datetime.datetime(2026, 1, 1),), ["text"])
+    # Fractional values would be rounded by an integer parameter
+    assert _param_types_match((2.6,), ["numeric"])
+    assert _param_types_match((2.6,), ["double precision"])
+    assert not _param_types_match((2.6,), ["integer"])
+    assert not _param_types_match((Decimal("2.6"),), ["bigint"])
+    assert _param_types_match((3,), ["numeric"])
+
+
+def test_classify_statement():
+    """Test DDL/DML detection from the leading keyword"""
+    assert _classify_statement("CREATE TABLE t (id INT)") == (True, False)
+    assert _classify_statement("  drop\ntable t") == (True, False)
+    assert _classify_statement("TRUNCATE t") == (True, False)
+    assert _classify_statement("\n  insert into t VALUES (1)") == (False, True)
+    assert _classify_statement("UPDATE\tt SET a = 1") == (False, True)
+    assert _classify_statement("DELETE FROM t") == (False, True)
+    assert _classify_statement("SELECT 1") == (False, False)
+    assert _classify_statement("WITH x AS (SELECT 1) SELECT * FROM x") == (False, False)
+    assert _classify_statement("(SELECT 1)") == (False, False)
+    assert _classify_statement("") == (False, False)
+
+
+def test_pool_retire_waits_for_borrowed_connections():
+    """Test retire() closes idle connections now and borrowed ones on return"""
+    with mock.patch("psycopg2.connect", side_effect=_FakeConnection):
+        conn_pool = _make_pool(1, 3)
+        borrowed = [conn_pool.getconn() for _ in range(2)]
+        idle = conn_pool.getconn()
+        conn_pool.putconn(idle)
+
+        conn_pool.retire()
+        assert idle.closed
+        assert not any(conn.closed for conn in borrowed)
+        assert not conn_pool.closed
+        try:
+            conn_pool.getconn()
+            assert False, "retired pool handed out a connection"
+        except psycopg2.pool.PoolError:
+            pass
+
+        for conn in borrowed:
+            conn_pool.putconn(conn)
+        assert all(conn.closed for conn in borrowed)
+        assert conn_pool.closed
+
+
+def _parse_copy_text_row(line):
+    """Decode a line of COPY text format the way the server does"""
+    escapes = {"\\": "\\", "t": "\t", "n": "\n", "r": "\r"}
+    fields = []
+    for field in line[:-1].split("\t"):
+        if field == "\\N":
+            fields.append(None)
+            continue
+        value, i = [], 0
+        while i < len(field):
+            if field[i] == "\\":
+                value.append(escapes[field[i + 1]])
+                i += 2
+            else:
+                value.append(field[i])
+                i += 1
+        fields.append("".join(value))
+    return fields
+
+
+def test_copy_text_row_round_trip():
+    """Test NULL, empty strings and a literal \\N survive COPY text format"""
+    row = (None, "", "\\N", "tab\there", "two\nlines\r", "back\\slash", 42)
+    line = _copy_text_row(row)
+    assert line.endswith("\n") and line.count("\n") == 1
+    assert _parse_copy_text_row(line) == [
+        None, "", "\\N", "tab\there", "two\nlines\r", "back\\slash", "42"
+    ]
+
+
+def _make_connector(**env):
+    """Build a connector without AWS, with a mocked DSQL client"""
+    env = {
+        "AWS_REGION": "us-east-1",
+        "DSQL_CLUSTER_ENDPOINT": "test.dsql.us-east-1.on.aws",
+        **env,
+    }
+    with mock.patch.dict(os.environ, env), mock.patch.object(
+        AuroraDSQLConnector, "_get_dsql_client"
+    ):
+        return AuroraDSQLConnector()
+
+
+class _FakeCursor:
+    """Records statements; pg_prepared_statements reports ``server_types``"""
+
+    def __init__(self, server_types):
+        self.executed = []
+        self.server_types = server_types
+        self.connection = SimpleNamespace(
+            statement_cache=OrderedDict(),
+            statement_cache_version=0,
+            cursor=lambda **kwargs: self,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def execute(self, query, params=None):
+        self.executed.append(query)
+
+    def fetchone(self):
+        return (self.server_types,)
+
+
+def test_statement_cache_keys_on_param_types():
+    """Test a cached statement is not reused for values of another type"""
+    connector = _make_connector()
+    cur = _FakeCursor(["integer", "integer"])
+    query = "SELECT count(*) AS n FROM stock WHERE s_w_id = %s AND s_i_id = %s"
+
+    connector._execute_cached(cur, query, (1, 3))
+    connector._execute_cached(cur, query, (1, 4))
+    assert [q.split()[0] for q in cur.executed] == ["PREPARE", "SELECT", "EXECUTE", "EXECUTE"]
+
+    # 2.6 would be rounded to 3 by the integer parameter, so it runs unprepared
+    connector._execute_cached(cur, query, (1, 2.6))
+    assert cur.executed[-2].startswith("DEALLOCATE")
+    assert cur.executed[-1] == query
+    assert len(cur.connection.statement_cache) == 2
+
+
+class _FakeConnection:
+    """Stands in for a psycopg2 connection in the pool tests"""
+
+    def __init__(self, *args, **kwargs):
+        self.closed = 0
+        self.autocommit = False
+        self.opened_at = time.monotonic()
+        self.info = SimpleNamespace(
+            transaction_status=psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        )
+
+    def close(self):
+        self.closed = 1
+
+    def rollback(self):
+        pass
+
+
+def _make_pool(minconn, maxconn, max_lifetime=None):
+    return _IAMAuthConnectionPool(
+        minconn,
+        maxconn,
+        lambda force_refresh=False: "token",
+        lambda conn: None,
+        max_lifetime=max_lifetime,
+    )
+
+
+def test_pool_keeps_connections_warm():
+    """Test returned connections are reused up to maxconn, not just minconn"""
+    with mock.patch("psycopg2.connect", side_effect=_FakeConnection) as connect:
+        conn_pool = _make_pool(1, 4)
+        for _ in range(10):
+            borrowed = [conn_pool.getconn() for _ in range(4)]
+            for conn in borrowed:
+                conn_pool.putconn(conn)
+        assert connect.call_count == 4
+        assert all(not conn.closed for conn in borrowed)
+
+
+def test_pool_retires_old_connections():
+    """Test connections past max_lifetime are closed instead of reused"""
+    with mock.patch("psycopg2.connect", side_effect=_FakeConnection) as connect:
+        conn_pool = _make_pool(1, 2, max_lifetime=60)
+
+        # Aged while borrowed: closed when returned
+        conn = conn_pool.getconn()
+        conn.opened_at -= 120
+        conn_pool.putconn(conn)
+        assert conn.closed
+
+        # Aged while idle: skipped when borrowing
+        idle = conn_pool.getconn()
+        conn_pool.putconn(idle)
+        idle.opened_at -= 120
+        fresh = conn_pool.getconn()
+        assert idle.closed
+        assert fresh is not idle and not fresh.closed
+        assert connect.call_count == 3
+
+
+def test_close_connection_forgets_health_check():
+    """Test test_connection() does not trust a pool that has been closed"""
+    connector = _make_connector()
+    connector.pool = mock.Mock()
+    connector._last_ok_ts = time.monotonic()
+    connector.close_connection()
+    assert connector.pool is None
+    assert connector._last_ok_ts is None
+
+    with mock.patch.object(
+        AuroraDSQLConnector, "_get_conn", side_effect=psycopg2.OperationalError
+    ):
+        assert connector.test_connection() is False
+
+
+def test_close_connection_while_borrowed():
+    """Test a connection borrowed before close_connection() can be returned"""
+    with mock.patch("psycopg2.connect", side_effect=_FakeConnection):
+        connector = _make_connector()
+        connector.pool = _make_pool(1, 2)
+        with connector._get_conn() as conn:
+            connector.close_connection()
+            assert connector.pool is None
+            assert not conn.closed
+        assert conn.closed
+
+
+def test_run_with_retries_recovers_from_conflicts():
+    """Test conflicts are retried with jittered backoff until one succeeds"""
+    connector = _make_connector(AWS_MAX_ATTEMPTS="3")
+    operation = mock.Mock(side_effect=[
+        psycopg2.errors.SerializationFailure(),
+        psycopg2.errors.DeadlockDetected(),
+        "done",
+    ])
+    with mock.patch("time.sleep") as sleep:
+        assert connector._run_with_retries(operation) == "done"
+    assert operation.call_count == 3
+    assert sleep.call_count == 2
+    for attempt, call in enumerate(sleep.call_args_list):
+        assert 0 <= call.args[0] <= RETRY_BASE_DELAY_SECONDS * 2**attempt
+
+
+def test_run_with_retries_gives_up():
+    """Test the last conflict is re-raised once max_attempts is reached"""
+    connector = _make_connector(AWS_MAX_ATTEMPTS="3")
+    conflicts = [psycopg2.errors.SerializationFailure() for _ in range(3)]
+    operation = mock.Mock(side_effect=conflicts)
+    with mock.patch("time.sleep") as sleep:
+        try:
+            connector._run_with_retries(operation)
+            assert False, "conflict was not re-raised"
+        except psycopg2.errors.SerializationFailure as e:
+            assert e is conflicts[-1]
+    assert operation.call_count == 3
+    assert sleep.call_count == 2
+
+
+def test_run_with_retries_ignores_other_errors():
+    """Test errors other than concurrency conflicts are not retried"""
+    connector = _make_connector(AWS_MAX_ATTEMPTS="3")
+    for error in (ValueError("bad item"), psycopg2.OperationalError("gone")):
+        operation = mock.Mock(side_effect=error)
+        with mock.patch("time.sleep") as sleep:
+            try:
+                connector._run_with_retries(operation)
+                assert False, f"{error!r} was not raised"
+            except type(error) as e:
+                assert e is error
+        assert operation.call_count == 1
+        sleep.assert_not_called()
+
+
+def test_auth_token_cache():
+    """Test IAM tokens are reused until close to expiry or forced"""
+    connector = _make_connector()
+    generate = connector._dsql.generate_db_connect_admin_auth_token
+    generate.side_effect = ["token-1", "token-2", "token-3"]
+
+    assert connector._get_aurora_dsql_token() == "token-1"
+    assert connector._get_aurora_dsql_token() == "token-1"
+    assert generate.call_count == 1
+    assert generate.call_args.kwargs["ExpiresIn"] == TOKEN_TTL_SECONDS
+
+    assert connector._get_aurora_dsql_token(force_refresh=True) == "token-2"
+    assert connector._get_aurora_dsql_token() == "token-2"
+
+    # Within the refresh margin of expiry a new token is minted
+    connector._token_exp = time.monotonic() + TOKEN_REFRESH_MARGIN_SECONDS - 1
+    assert connector._get_aurora_dsql_token() == "token-3"
+    assert generate.call_count == 3
+
+
+def test_execute_many_pages_and_retries():
+    """Test execute_many retries only the page that hit a conflict"""
+    connector = _make_connector()
+    conn = mock.MagicMock()
+    borrow = mock.MagicMock()
+    borrow.__enter__.return_value = conn
+    sent = []
+
+    def fake_execute_batch(cur, query, page, page_size):
+        sent.append(list(page))
+        if len(sent) == 2:
+            raise psycopg2.errors.SerializationFailure()
+
+    with mock.patch.object(
+        AuroraDSQLConnector, "_get_conn", return_value=borrow
+    ), mock.patch(
+        "database.aurora_connector.execute_batch", side_effect=fake_execute_batch
+    ), mock.patch("time.sleep"):
+        params_list = [(i,) for i in range(5)]
+        connector.execute_many("UPDATE t SET a = %s", params_list, page_size=2)
+
+    assert sent == [[(0,), (1,)], [(2,), (3,)], [(2,), (3,)], [(4,)]]
+    conn.commit.assert_not_called()
+
+
+def test_execute_many_rejects_bad_page_size():
+    """Test page_size must fit Aurora DSQL's per-transaction row limit"""
+    connector = _make_connector()
+    for page_size in (0, -1, 3001):
+        try:
+            connector.execute_many("UPDATE t SET a = %s", [(1,)], page_size=page_size)
+            assert False, f"page_size={page_size} was accepted"
+        except ValueError:
+            pass
+
+
+if __name__ == "__main__":
+    test_to_positional()
+    test_has_quoted_placeholder()
+    test_param_types_match()
+    test_classify_statement()
+    test_copy_text_row_round_trip()
+    test_statement_cache_keys_on_param_types()
+    test_close_connection_forgets_health_check()
+    test_close_connection_while_borrowed()
+    test_run_with_retries_recovers_from_conflicts()
+    test_run_with_retries_gives_up()
+    test_run_with_retries_ignores_other_errors()
+    test_auth_token_cache()
+    test_execute_many_pages_and_retries()
+    test_execute_many_rejects_bad_page_size()
+    test_pool_keeps_connections_warm()
+    test_pool_retires_old_connections()
+    test_pool_retire_waits_for_borrowed_connections()
+    print("✅ Aurora DSQL connector helper tests passed!")